@@ -18,9 +18,123 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 # SPDX-License-Identifier: GPL-3.0-or-later
-__all__ = ["__version__", "logger"]
+from __future__ import annotations
+
+__all__ = ["Logger", "__version__", "logger"]
 __version__ = "0.7.0"
+import contextlib
+import sys
+import threading
+from typing import TYPE_CHECKING
+
 import mylog
 
-logger = mylog.root.create_child("lemming")
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+class Logger(mylog.Logger):
+    """
+    A logger whose indentation is per thread, and which can buffer events.
+
+    When the tools run in parallel, each worker thread buffers its events
+    (and the output of the commands, see `write_output`), which are then
+    logged in the order of the tools with `replay`, so the output of the
+    tools is neither interleaved nor wrongly indented.
+    """
+
+    @property
+    def _thread_state(self) -> threading.local:
+        state: threading.local = self.__dict__.setdefault(
+            "_thread_state", threading.local()
+        )
+        return state
+
+    @property
+    def indentation(self) -> int:
+        """The indentation of the current thread."""
+        indentation: int = getattr(self._thread_state, "indentation", 0)
+        return indentation
+
+    @indentation.setter
+    def indentation(self, value: int) -> None:
+        self._thread_state.indentation = value
+
+    def is_buffering(self) -> bool:
+        """
+        Are the events of the current thread buffered?
+
+        Returns:
+            bool: True if they are, False otherwise.
+        """
+        return getattr(self._thread_state, "buffer", None) is not None
+
+    @contextlib.contextmanager
+    def buffer(
+        self, indentation: int
+    ) -> Iterator[list[mylog.LogEvent | bytes]]:
+        """
+        Buffer the events of the current thread, instead of logging them.
+
+        Args:
+            indentation (int): The indentation to start with, usually the
+                indentation of the thread that started this one.
+
+        Yields:
+            list[mylog.LogEvent | bytes]: The buffered events and outputs.
+        """
+        state = self._thread_state
+        buffer: list[mylog.LogEvent | bytes] = []
+        old_indentation = self.indentation
+        state.buffer = buffer
+        state.indentation = indentation
+        try:
+            yield buffer
+        finally:
+            state.buffer = None
+            state.indentation = old_indentation
+
+    def log(self, event: mylog.LogEvent) -> None:
+        """
+        Log the event, or buffer it if the current thread is buffering.
+
+        Args:
+            event (mylog.LogEvent): The event to log.
+        """
+        buffer = getattr(self._thread_state, "buffer", None)
+        if buffer is None:
+            super().log(event)
+        else:
+            buffer.append(event)
+
+    def write_output(self, output: bytes) -> None:
+        """
+        Write the output of a command, or buffer it if the thread is buffering.
+
+        Args:
+            output (bytes): The output.
+        """
+        buffer = getattr(self._thread_state, "buffer", None)
+        if buffer is None:
+            sys.stdout.buffer.write(output)
+            sys.stdout.buffer.flush()
+        else:
+            buffer.append(output)
+
+    def replay(self, buffer: Iterable[mylog.LogEvent | bytes]) -> None:
+        """
+        Log the events and write the outputs buffered with `buffer`.
+
+        Args:
+            buffer (Iterable[mylog.LogEvent | bytes]): The buffer.
+        """
+        for item in buffer:
+            if isinstance(item, bytes):
+                self.write_output(item)
+            else:
+                self.log(item)
+
+
+logger = Logger.new(name="lemming", parent=mylog.root)
+logger.inherit()
 logger.threshold = mylog.Level.INFO
@@ -18,49 +18,74 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 # SPDX-License-Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
 import dataclasses
+import enum
+import os
 import pathlib
+import shlex
 import sys
 import time
 
 # from some reason Typer doesn't support X | None
-from typing import Annotated, Optional
+from typing import TYPE_CHECKING, Annotated, Optional, cast
 
 import typer
-from typing_extensions import Self
-
-from . import __version__, logger
-from .config import (
-    Config,
-    Formatter,
-    Linter,
-    WhatToQuiet,
-    get_config,
-    get_config_dot_lemming,
-    get_config_pyproject,
-)
-
-PRE_COMMIT_FILE = """#!/bin/sh
-#!/usr/bin/env bash
+from typing_extensions import TypeVar
+
+from . import __version__, cache, logger
+from .cpu import get_cpu_count
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+    import mylog
+
+    # .config imports pydantic, which is slow; only import it when needed
+    from .config import Config, Formatter, Installer, Linter, WhatToQuiet
+
+PRE_COMMIT_FILE = """#!/usr/bin/env bash
 # File generated by Lemming: https://github.com/koviubi56/lemming
 
 set -euo pipefail
-PYTHON='{}'
+PYTHON={python}
 
-if [[ -n "${LEMMING_VERBOSE:-}" ]]; then
-    exec $PYTHON -m lemming format --verbose $(pwd)
+if [[ -n "${{LEMMING_VERBOSE:-}}" ]]; then
+    exec "$PYTHON" -m lemming format --verbose "$(pwd)"
     ret_code=$?
 else
-    exec $PYTHON -m lemming format --quiet-pip "$(pwd)"
+    exec "$PYTHON" -m lemming format --quiet-pip "$(pwd)"
     ret_code=$?
 fi
 exit $ret_code
 """
 
+# environment variables which limit the threads of common runtimes/tools
+THREAD_LIMIT_VARIABLES = ("OMP_NUM_THREADS", "RAYON_NUM_THREADS")
+
 app = typer.Typer(no_args_is_help=True)
+T = TypeVar("T")
+
+
+class RunStatus(enum.IntEnum):
+    """
+    The result of running a formatter or a linter.
+
+    The result of running multiple of them is the greatest (worst) status.
+    """
+
+    OK = 0
+    """It ran successfully (or it was cached)."""
+    FAILED = 1
+    """It failed, but the others should still run."""
+    FATAL = 2
+    """It failed, and fail fast is True, so nothing else should run."""
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class Settings:
     """
     The settings.
@@ -68,13 +93,29 @@ class Settings:
     Args:
         what_to_quiet (WhatToQuiet): What to quiet.
         config (Config): The configuration.
-        only (list[str] | None): Only run these formatters/linters. If
+        only (frozenset[str] | None): Only run these formatters/linters. If
             None, run all.
+        workers (int, optional): The maximum number of formatters/linters to
+            run at the same time. Defaults to 1.
+        offline (bool, optional): Whether or not to skip installing the
+            packages. Defaults to False.
+        installer (Installer, optional): What to install the packages with.
+            Defaults to "auto".
+        config_file (pathlib.Path | None, optional): The file the
+            configuration was read from. Defaults to None.
+        files_digest (str | None, optional): The digest of the files to
+            check, if the results are cached. See `compute_files_digest`.
+            Defaults to None.
     """
 
     what_to_quiet: WhatToQuiet
     config: Config
-    only: list[str] | None
+    only: frozenset[str] | None
+    workers: int = 1
+    offline: bool = False
+    installer: Installer = "auto"
+    config_file: pathlib.Path | None = None
+    files_digest: str | None = None
 
     def should_run(self, name: str) -> bool:
         """
@@ -91,26 +132,74 @@ class Settings:
         return name in self.only
 
 
-class Timer:
-    """A timer."""
+def seconds_since(start: int) -> float:
+    """
+    Get the seconds elapsed since `start`.
+
+    Args:
+        start (int): The start time, from `time.perf_counter_ns()`.
+
+    Returns:
+        float: The elapsed time in seconds.
+    """
+    return (time.perf_counter_ns() - start) / 1e9
 
-    def __init__(self) -> None:
-        """Create a Timer instance."""
-        self.start: float | None = None
-        self.time: float | None = None
 
-    def __enter__(self) -> Self:
-        self.start = time.perf_counter()
-        return self
+def compute_files_digest(paths: list[pathlib.Path], settings: Settings) -> str:
+    """
+    Compute the digest of `paths` and of the config files.
 
-    def __exit__(self, *_: object) -> None:
-        assert self.start  # noqa: S101
-        self.time = time.perf_counter() - self.start
+    The config files are the lemming config file, and
+    `cache.TOOL_CONFIG_FILES` in the current working directory.
+
+    Args:
+        paths (list[pathlib.Path]): The paths to check.
+        settings (Settings): The settings.
+
+    Returns:
+        str: The digest.
+    """
+    config_files = [pathlib.Path(name) for name in cache.TOOL_CONFIG_FILES]
+    if settings.config_file:
+        config_files.append(settings.config_file)
+    return cache.get_files_digest(paths, config_files)
+
+
+def get_files_digest(paths: list[pathlib.Path], settings: Settings) -> str:
+    """
+    Get the digest of `paths`, preferably the one computed for this run.
+
+    Args:
+        paths (list[pathlib.Path]): The paths to check.
+        settings (Settings): The settings.
+
+    Returns:
+        str: `settings.files_digest`, or `compute_files_digest` if that is
+            None.
+    """
+    if settings.files_digest is None:
+        return compute_files_digest(paths, settings)
+    return settings.files_digest
+
+
+def failed(settings: Settings) -> RunStatus:
+    """
+    Get the status of a failed formatter or linter.
+
+    Args:
+        settings (Settings): The settings.
+
+    Returns:
+        RunStatus: FATAL if fail fast is True, FAILED otherwise.
+    """
+    if settings.config.fail_fast:
+        return RunStatus.FATAL
+    return RunStatus.FAILED
 
 
 def run_linter(
-    linter: Linter, paths: list[pathlib.Path], settings: Settings
-) -> bool:
+    linter: Linter, paths: list[pathlib.Path], settings: Settings, cpus: int
+) -> RunStatus:
     """
     Run `linter`.
 
@@ -118,53 +207,179 @@ def run_linter(
         linter (Linter): The linter to run.
         paths (list[pathlib.Path]): The paths to lint.
         settings (Settings): The settings.
-
-    Raises:
-        typer.Exit: If the linter failed and fail fast is True.
+        cpus (int): The number of CPUs the linter may use.
 
     Returns:
-        bool: `exit_status == 0`
+        RunStatus: The result.
     """
     with logger.indent:
-        with Timer() as linter_timer:
-            success = linter.run(paths, settings.what_to_quiet)
-            if not success:
-                logger.error(
-                    f"Could not run linter {linter.name}!"
-                    " Please see the linter's output for more"
-                    " details."
-                )
-                if settings.config.fail_fast:
-                    raise typer.Exit(1)
-                return False
-        logger.info(f"Ran linter in {linter_timer.time} seconds")
-        return True
+        start = time.perf_counter_ns()
+        cache_key = None
+        if settings.config.cache:
+            cache_key = cache.get_key(
+                linter, linter.command, get_files_digest(paths, settings)
+            )
+            if cache.is_cached(cache_key):
+                logger.info(f"Linter {linter.name} is cached, skipping")
+                return RunStatus.OK
+        success = linter.run(
+            paths,
+            settings.what_to_quiet,
+            install=not settings.offline,
+            max_batches=cpus,
+            installer=settings.installer,
+        )
+        if not success:
+            logger.error(
+                f"Could not run linter {linter.name}!"
+                " Please see the linter's output for more"
+                " details."
+            )
+            return failed(settings)
+        if cache_key:
+            cache.set_cached(cache_key)
+        logger.info(f"Ran linter in {seconds_since(start):.3f} seconds")
+        return RunStatus.OK
 
 
-def linter_first(paths: list[pathlib.Path], settings: Settings) -> bool:
+@contextlib.contextmanager
+def limit_threads(threads: int) -> Iterator[None]:
     """
-    Run the first linters.
+    Limit the threads of the tools started in the meantime to `threads`.
+
+    Sets the `THREAD_LIMIT_VARIABLES` environment variables, except the ones
+    the user already set, and removes them afterwards.
 
     Args:
+        threads (int): The maximum number of threads per tool.
+
+    Yields:
+        None: Nothing.
+    """
+    variables = [
+        variable
+        for variable in THREAD_LIMIT_VARIABLES
+        if variable not in os.environ
+    ]
+    for variable in variables:
+        os.environ[variable] = str(threads)
+    try:
+        yield
+    finally:
+        for variable in variables:
+            del os.environ[variable]
+
+
+def get_cpus_per_tool(workers: int) -> int:
+    """
+    Get the number of CPUs each tool may use.
+
+    Args:
+        workers (int): The number of tools running at the same time.
+
+    Returns:
+        int: The CPUs divided evenly between the tools, at least 1.
+    """
+    return max(1, get_cpu_count() // max(1, workers))
+
+
+def run_tools(
+    runner: Callable[[T], RunStatus], tools: Sequence[T], workers: int
+) -> RunStatus:
+    """
+    Run `runner` with every tool in `tools`.
+
+    After a tool's status is FATAL, no more tools are started. When the
+    tools run in parallel, the logs (and the output of the commands) of each
+    tool are buffered, and written in the order of `tools` as soon as the
+    tool and the ones before it are done.
+
+    Args:
+        runner (Callable[[T], RunStatus]): The function that runs a tool.
+        tools (Sequence[T]): The tools to run.
+        workers (int): The maximum number of tools to run at the same time.
+            If less than 2, the tools are run one after the other.
+
+    Returns:
+        RunStatus: The worst status of the tools.
+    """
+    status = RunStatus.OK
+    workers = min(workers, len(tools))
+    if workers < 2:  # noqa: PLR2004
+        for tool in tools:
+            status = max(status, runner(tool))
+            if status is RunStatus.FATAL:
+                break
+        return status
+    indentation = logger.indentation
+
+    def run_buffered(
+        tool: T,
+    ) -> tuple[RunStatus, list[mylog.LogEvent | bytes]]:
+        with logger.buffer(indentation) as buffer:
+            return runner(tool), buffer
+
+    # don't let N tools each start a thread per CPU
+    with (
+        limit_threads(get_cpus_per_tool(workers)),
+        concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor,
+    ):
+        futures = [executor.submit(run_buffered, tool) for tool in tools]
+        replayed = 0
+        for future in concurrent.futures.as_completed(futures):
+            status = max(status, future.result()[0])
+            while replayed < len(futures) and futures[replayed].done():
+                logger.replay(futures[replayed].result()[1])
+                replayed += 1
+            if status is RunStatus.FATAL:
+                executor.shutdown(cancel_futures=True)
+                break
+    # the tools that were still running when a tool's status was FATAL
+    for future in futures[replayed:]:
+        if not future.cancelled():
+            logger.replay(future.result()[1])
+    return status
+
+
+def linter(
+    kind: str,
+    linters: list[Linter],
+    paths: list[pathlib.Path],
+    settings: Settings,
+) -> RunStatus:
+    """
+    Run the first or the other linters.
+
+    Args:
+        kind (str): The kind of the linters, "first" or "other". Only used
+            for logging.
+        linters (list[Linter]): The linters to run.
         paths (list[pathlib.Path]): The paths to lint.
         settings (Settings): The settings.
 
     Returns:
-        bool: Whether or not all linters successfully ran.
+        RunStatus: The worst status of the linters.
     """
-    logger.info("Running first linters")
-    return_value = True
+
+    def run_one(linter: Linter) -> RunStatus:
+        logger.info(f"Running {kind} linter {linter.name}")
+        return run_linter(linter, paths, settings, cpus)
+
+    logger.info(f"Running {kind} linters")
     with logger.indent:
-        with Timer() as linters_timer:
-            for linter in settings.config.get_first_linters():
-                if not settings.should_run(linter.name):
-                    logger.info(f"Skipping first linter {linter.name}")
-                    continue
-                logger.info(f"Running first linter {linter.name}")
-                success = run_linter(linter, paths, settings)
-                if not success:
-                    return_value = False
-        logger.info(f"Ran all (first) linters in {linters_timer.time} seconds")
+        start = time.perf_counter_ns()
+        linters_to_run = []
+        for linter_ in linters:
+            if not settings.should_run(linter_.name):
+                logger.info(f"Skipping {kind} linter {linter_.name}")
+                continue
+            linters_to_run.append(linter_)
+        # the batches of the linters must not oversubscribe the CPUs either
+        cpus = get_cpus_per_tool(min(settings.workers, len(linters_to_run)))
+        return_value = run_tools(run_one, linters_to_run, settings.workers)
+        logger.info(
+            f"Ran all {kind} linters in {seconds_since(start):.3f} seconds"
+        )
         return return_value
 
 
@@ -173,7 +388,8 @@ def run_formatter(
     paths: list[pathlib.Path],
     format_: bool,
     settings: Settings,
-) -> bool:
+    cpus: int,
+) -> RunStatus:
     """
     Run `formatter`.
 
@@ -182,83 +398,89 @@ def run_formatter(
         paths (list[pathlib.Path]): The paths to format/check.
         format_ (bool): Whether or not to format or check.
         settings (Settings): The settings.
-
-    Raises:
-        typer.Exit: If the formatter failed and fail fast is True.
+        cpus (int): The number of CPUs the formatter may use.
 
     Returns:
-        bool: `exit_status == 0`
+        RunStatus: The result.
     """
     with logger.indent:
-        with Timer() as formatter_timer:
-            if format_:
-                success = formatter.run_format(paths, settings.what_to_quiet)
-            else:
-                success = formatter.run_check(paths, settings.what_to_quiet)
+        start = time.perf_counter_ns()
+        cache_key = None
+        # formatting modifies the files, so only checks are cached
+        if settings.config.cache and not format_ and formatter.check_command:
+            cache_key = cache.get_key(
+                formatter,
+                formatter.check_command,
+                get_files_digest(paths, settings),
+            )
+            if cache.is_cached(cache_key):
+                logger.info(f"Formatter {formatter.name} is cached, skipping")
+                return RunStatus.OK
+        if format_:
+            success = formatter.run_format(
+                paths,
+                settings.what_to_quiet,
+                install=not settings.offline,
+                max_batches=cpus,
+                installer=settings.installer,
+            )
+        else:
+            success = formatter.run_check(
+                paths,
+                settings.what_to_quiet,
+                install=not settings.offline,
+                max_batches=cpus,
+                installer=settings.installer,
+            )
 
-            if not success:
-                logger.error(f"Could not run formatter {formatter.name}!")
-                if settings.config.fail_fast:
-                    raise typer.Exit(1)
-                return False
-        logger.info(f"Ran formatter in {formatter_timer.time} seconds")
-        return True
+        if not success:
+            logger.error(f"Could not run formatter {formatter.name}!")
+            return failed(settings)
+        if cache_key:
+            cache.set_cached(cache_key)
+        logger.info(f"Ran formatter in {seconds_since(start):.3f} seconds")
+        return RunStatus.OK
 
 
 def formatter(
     format_: bool, paths: list[pathlib.Path], settings: Settings
-) -> bool:
+) -> RunStatus:
     """
     Run all formatters.
 
+    Formatters only run in parallel when checking, since formatting the same
+    files concurrently would race.
+
     Args:
         format_ (bool): Whether or not to format or check.
         paths (list[pathlib.Path]): The paths to format/check.
         settings (Settings): The settings.
 
     Returns:
-        bool: Whether or not all formatters successfully ran.
-    """
-    logger.info("Running formatters")
-    return_value = True
-    with logger.indent:
-        with Timer() as formatters_timer:
-            for formatter in settings.config.formatters:
-                if not settings.should_run(formatter.name):
-                    logger.info(f"Skipping formatter {formatter.name}")
-                    continue
-                logger.info(f"Running formatter {formatter.name}")
-                success = run_formatter(formatter, paths, format_, settings)
-                if not success:
-                    return_value = False
-        logger.info(f"Ran all formatters in {formatters_timer.time} seconds")
-        return return_value
-
-
-def linter_other(paths: list[pathlib.Path], settings: Settings) -> bool:
+        RunStatus: The worst status of the formatters.
     """
-    Run all other linters.
 
-    Args:
-        paths (list[pathlib.Path]): The paths to lint.
-        settings (Settings): The settings.
+    def run_one(formatter: Formatter) -> RunStatus:
+        logger.info(f"Running formatter {formatter.name}")
+        return run_formatter(formatter, paths, format_, settings, cpus)
 
-    Returns:
-        bool: Whether or not all other linters successfully ran.
-    """
-    logger.info("Running other linters")
-    return_value = True
+    logger.info("Running formatters")
     with logger.indent:
-        with Timer() as linters_timer:
-            for linter in settings.config.get_other_linters():
-                if not settings.should_run(linter.name):
-                    logger.info(f"Skipping other linter {linter.name}")
-                    continue
-                logger.info(f"Running other linter {linter.name}")
-                success = run_linter(linter, paths, settings)
-                if not success:
-                    return_value = False
-        logger.info(f"Ran all other linters in {linters_timer.time} seconds")
+        start = time.perf_counter_ns()
+        formatters = []
+        for formatter in settings.config.formatters:
+            if not settings.should_run(formatter.name):
+                logger.info(f"Skipping formatter {formatter.name}")
+                continue
+            formatters.append(formatter)
+        workers = 1 if format_ else settings.workers
+        # the batches of the formatters must not oversubscribe the CPUs
+        # either
+        cpus = get_cpus_per_tool(min(workers, len(formatters)))
+        return_value = run_tools(run_one, formatters, workers)
+        logger.info(
+            f"Ran all formatters in {seconds_since(start):.3f} seconds"
+        )
         return return_value
 
 
@@ -272,26 +494,65 @@ def run(paths: list[pathlib.Path], format_: bool, settings: Settings) -> None:
         settings (Settings): The settings.
 
     Raises:
-        typer.Exit: If any formatter or linter failed and fail fast is False.
+        typer.Exit: If any formatter or linter failed.
     """
-    with Timer() as all_timer:
-        success = True
-        if linter_first(paths, settings) is False:
-            success = False
-        if formatter(format_, paths, settings) is False:
-            success = False
-        if linter_other(paths, settings) is False:
-            success = False
-
-        if not success:
-            logger.error(
-                "Failed, due to one or more linters/formatters failing. (HINT:"
-                " Set fail_fast=true to disable this behavior)"
+    start = time.perf_counter_ns()
+    # one pip run is much faster than one per tool, but with the cache most
+    # tools (and their installs) are usually skipped
+    if (
+        not settings.offline
+        and not settings.config.cache
+        and not settings.config.install_all(
+            settings.what_to_quiet.pip,
+            settings.only,
+            settings.installer,
+            format_,
+        )
+    ):
+        logger.warning(
+            "Could not install all packages at once, installing them one by"
+            " one"
+        )
+    if settings.config.cache:
+        cache.prune()
+        settings = dataclasses.replace(
+            settings, files_digest=compute_files_digest(paths, settings)
+        )
+    # every phase should run, even if an earlier one failed, unless it was
+    # fatal
+    status = linter("first", settings.config.first_linters, paths, settings)
+    if status is not RunStatus.FATAL:
+        status = max(status, formatter(format_, paths, settings))
+    if status is not RunStatus.FATAL:
+        if (
+            settings.config.cache
+            and format_
+            and any(
+                settings.should_run(formatter_.name)
+                for formatter_ in settings.config.formatters
+            )
+        ):
+            # the formatters changed the files, so the other linters must
+            # not be keyed on the files as they were before
+            settings = dataclasses.replace(
+                settings, files_digest=compute_files_digest(paths, settings)
             )
-            raise typer.Exit(1)
+        status = max(
+            status,
+            linter("other", settings.config.other_linters, paths, settings),
+        )
+
+    if status is RunStatus.FATAL:
+        raise typer.Exit(1)
+    if status is RunStatus.FAILED:
+        logger.error(
+            "Failed, due to one or more linters/formatters failing. (HINT:"
+            " Set fail_fast=true to disable this behavior)"
+        )
+        raise typer.Exit(1)
     logger.info(
-        f"Successfully ran all formatters and linters in {all_timer.time}"
-        " seconds with no errors. Good job!"
+        "Successfully ran all formatters and linters in"
+        f" {seconds_since(start):.3f} seconds with no errors. Good job!"
     )
 
 
@@ -325,6 +586,51 @@ def verbose_callback(value: bool) -> bool:
     return value
 
 
+def parse_concurrency(value: str) -> int:
+    """
+    Parse the value of the `--concurrency` option.
+
+    Args:
+        value (str): "auto", or a positive integer.
+
+    Raises:
+        typer.BadParameter: If `value` is invalid.
+
+    Returns:
+        int: The number of formatters/linters to run at the same time, or 0
+            for "auto".
+    """
+    if value == "auto":
+        return 0
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        msg = f"must be 'auto' or a positive integer, not {value!r}"
+        raise typer.BadParameter(msg)
+    return workers
+
+
+def parse_installer(value: str) -> str:
+    """
+    Parse the value of the `--installer` option.
+
+    Args:
+        value (str): "auto", "pip" or "uv".
+
+    Raises:
+        typer.BadParameter: If `value` is invalid.
+
+    Returns:
+        str: `value`
+    """
+    if value not in {"auto", "pip", "uv"}:
+        msg = f"must be 'auto', 'pip' or 'uv', not {value!r}"
+        raise typer.BadParameter(msg)
+    return value
+
+
 def version_callback(value: bool) -> bool:
     """
     Print the version and exit if `value`.
@@ -351,6 +657,9 @@ def both(
     quiet: bool,
     config: pathlib.Path | None,
     only: list[str] | None,
+    concurrency: int | None,
+    offline: bool,
+    installer: Installer | None,
 ) -> Settings:
     """
     Create the settings, and do some stuff with the given options.
@@ -367,6 +676,12 @@ def both(
         config (pathlib.Path | None): The configuration to use or None.
         only (list[str] | None): Only run these formatters/linters. If
             None, run all.
+        concurrency (int | None): The number of formatters/linters to run at
+            the same time, 0 for the number of CPUs, or None to decide based
+            on the config's `parallel`.
+        offline (bool): Whether or not to skip installing the packages.
+        installer (Installer | None): What to install the packages with, or
+            None to use the config's `installer`.
 
     Raises:
         typer.Exit: If both verbose and quiet is passed.
@@ -374,149 +689,179 @@ def both(
     Returns:
         Settings: The settings.
     """
+    # .config imports pydantic, which is slow; only import it when needed
+    from .config import (  # noqa: PLC0415
+        WhatToQuiet,
+        find_config_file,
+        get_config_dot_lemming,
+        get_config_pyproject,
+    )
+
     if verbose and quiet:
         logger.critical("Verbose and quiet are mutually exclusive!")
         raise typer.Exit(2)
-    if config:
-        config_ = (
-            get_config_pyproject(config)
-            if config.name == "pyproject.toml"
-            else get_config_dot_lemming(config.parent)
-        )
+    config_file = config or find_config_file(pathlib.Path.cwd())
+    config_ = (
+        get_config_pyproject(config_file)
+        if config_file.name == "pyproject.toml"
+        else get_config_dot_lemming(config_file)
+    )
+    if concurrency is None:
+        workers = get_cpu_count() if config_.parallel else 1
     else:
-        config_ = get_config(".")
+        workers = concurrency or get_cpu_count()
     return Settings(
         what_to_quiet=WhatToQuiet(commands=quiet_commands, pip=quiet_pip),
         config=config_,
-        only=only,
+        only=frozenset(only) if only else None,
+        workers=workers,
+        offline=offline,
+        installer=installer or config_.installer,
+        config_file=config_file,
     )
 
 
+# the options shared by the commands
+PathsArgument = Annotated[list[pathlib.Path], typer.Argument(exists=True)]
+QuietCommandsOption = Annotated[
+    bool,
+    typer.Option(
+        ...,
+        "--quiet-commands",
+        "--qc",
+        help="If passed the output of the formatters and linters will be"
+        " hidden.",
+    ),
+]
+QuietPipOption = Annotated[
+    bool,
+    typer.Option(
+        ...,
+        "--quiet-pip",
+        "--qp",
+        help="If passed the output of pip will be hidden.",
+    ),
+]
+VerboseOption = Annotated[
+    bool,
+    typer.Option(
+        "--verbose",
+        "-v",
+        callback=verbose_callback,
+        help="When passed the logger's threshold will be decreased by 10"
+        " (may be passed multiple times)",
+    ),
+]
+QuietOption = Annotated[
+    bool,
+    typer.Option(
+        "--quiet",
+        "-q",
+        callback=quiet_callback,
+        help="When passed the logger's threshold will be increased by 10"
+        " (may be passed multiple times)",
+    ),
+]
+ConfigOption = Annotated[
+    Optional[pathlib.Path],  # noqa: UP007
+    typer.Option(exists=True, dir_okay=False, help="The config file to use."),
+]
+OnlyOption = Annotated[
+    Optional[list[str]],  # noqa: UP007
+    typer.Option(
+        help="Only run these formatters/linters (may be passed multiple times)"
+    ),
+]
+OfflineOption = Annotated[
+    bool,
+    typer.Option(
+        "--offline",
+        help="If passed the packages will not be installed, they must be"
+        " installed already.",
+    ),
+]
+ConcurrencyOption = Annotated[
+    Optional[int],  # noqa: UP007
+    typer.Option(
+        metavar="auto|N",
+        parser=parse_concurrency,
+        help="Run this many linters (and formatters when checking) at the"
+        " same time, or one per CPU with auto. Overrides the parallel"
+        " config option.",
+    ),
+]
+
+InstallerOption = Annotated[
+    Optional[str],  # noqa: UP007
+    typer.Option(
+        metavar="auto|pip|uv",
+        parser=parse_installer,
+        help="What to install the packages with: uv if it is installed"
+        " (else pip) with auto, pip, or uv. Overrides the installer config"
+        " option.",
+    ),
+]
+
+
 @app.command("format")
 def format_(
-    paths: Annotated[list[pathlib.Path], typer.Argument(exists=True)],
-    quiet_commands: Annotated[
-        bool,
-        typer.Option(
-            ...,
-            "--quiet-commands",
-            "--qc",
-            help="If passed the output of the formatters and linters will be"
-            " hidden.",
-        ),
-    ] = False,
-    quiet_pip: Annotated[
-        bool,
-        typer.Option(
-            ...,
-            "--quiet-pip",
-            "--qp",
-            help="If passed the output of pip will be hidden.",
-        ),
-    ] = False,
-    verbose: Annotated[
-        bool,
-        typer.Option(
-            "--verbose",
-            "-v",
-            callback=verbose_callback,
-            help="When passed the logger's threshold will be decreased by 10"
-            " (may be passed multiple times)",
-        ),
-    ] = False,
-    quiet: Annotated[
-        bool,
-        typer.Option(
-            "--quiet",
-            "-q",
-            callback=quiet_callback,
-            help="When passed the logger's threshold will be increased by 10"
-            " (may be passed multiple times)",
-        ),
-    ] = False,
-    config: Annotated[
-        Optional[pathlib.Path],  # noqa: UP007
-        typer.Option(
-            exists=True, dir_okay=False, help="The config file to use."
-        ),
-    ] = None,
-    only: Annotated[
-        Optional[list[str]],  # noqa: UP007
-        typer.Option(
-            help="Only run these formatters/linters (may be passed multiple"
-            " times)"
-        ),
-    ] = None,
+    paths: PathsArgument,
+    quiet_commands: QuietCommandsOption = False,
+    quiet_pip: QuietPipOption = False,
+    verbose: VerboseOption = False,
+    quiet: QuietOption = False,
+    config: ConfigOption = None,
+    only: OnlyOption = None,
+    concurrency: ConcurrencyOption = None,
+    offline: OfflineOption = False,
+    installer: InstallerOption = None,
 ) -> None:
     """Format your code and run linters."""
     run(
         paths,
         True,
-        both(quiet_commands, quiet_pip, verbose, quiet, config, only),
+        both(
+            quiet_commands,
+            quiet_pip,
+            verbose,
+            quiet,
+            config,
+            only,
+            concurrency,
+            offline,
+            cast("Installer | None", installer),
+        ),
     )
 
 
 @app.command()
 def check(
-    paths: Annotated[list[pathlib.Path], typer.Argument(exists=True)],
-    quiet_commands: Annotated[
-        bool,
-        typer.Option(
-            ...,
-            "--quiet-commands",
-            "--qc",
-            help="If passed the output of the formatters and linters will be"
-            " hidden.",
-        ),
-    ] = False,
-    quiet_pip: Annotated[
-        bool,
-        typer.Option(
-            ...,
-            "--quiet-pip",
-            "--qp",
-            help="If passed the output of pip will be hidden.",
-        ),
-    ] = False,
-    verbose: Annotated[
-        bool,
-        typer.Option(
-            "--verbose",
-            "-v",
-            callback=verbose_callback,
-            help="When passed the logger's threshold will be decreased by 10"
-            " (may be passed multiple times)",
-        ),
-    ] = False,
-    quiet: Annotated[
-        bool,
-        typer.Option(
-            "--quiet",
-            "-q",
-            callback=quiet_callback,
-            help="When passed the logger's threshold will be increased by 10"
-            " (may be passed multiple times)",
-        ),
-    ] = False,
-    config: Annotated[
-        Optional[pathlib.Path],  # noqa: UP007
-        typer.Option(
-            exists=True, dir_okay=False, help="The config file to use"
-        ),
-    ] = None,
-    only: Annotated[
-        Optional[list[str]],  # noqa: UP007
-        typer.Option(
-            help="Only run these formatters/linters (may be passed multiple"
-            " times)"
-        ),
-    ] = None,
+    paths: PathsArgument,
+    quiet_commands: QuietCommandsOption = False,
+    quiet_pip: QuietPipOption = False,
+    verbose: VerboseOption = False,
+    quiet: QuietOption = False,
+    config: ConfigOption = None,
+    only: OnlyOption = None,
+    concurrency: ConcurrencyOption = None,
+    offline: OfflineOption = False,
+    installer: InstallerOption = None,
 ) -> None:
     """Check the formatting of your code and run linters."""
     run(
         paths,
         False,
-        both(quiet_commands, quiet_pip, verbose, quiet, config, only),
+        both(
+            quiet_commands,
+            quiet_pip,
+            verbose,
+            quiet,
+            config,
+            only,
+            concurrency,
+            offline,
+            cast("Installer | None", installer),
+        ),
     )
 
 
@@ -546,8 +891,21 @@ def install_pre_commit(git_repository: pathlib.Path) -> None:
             f"pre-commit file {pre_commit} already exists! Overwriting..."
         )
     logger.info(f"Creating pre-commit git hook (it will use {sys.executable})")
+    temporary = pre_commit.with_suffix(".tmp")
     try:
-        pre_commit.write_text(PRE_COMMIT_FILE.replace("{}", sys.executable))
+        temporary.write_bytes(
+            PRE_COMMIT_FILE.format(python=shlex.quote(sys.executable)).encode(
+                "utf-8"
+            )
+        )
+        try:
+            temporary.chmod(0o755)
+            # replace atomically, so the hook is never half-written
+            temporary.replace(pre_commit)
+        except BaseException:
+            # don't leave the temporary file in .git/hooks
+            temporary.unlink(missing_ok=True)
+            raise
     except OSError as exception:
         logger.critical("Could not write pre-commit file!", True)
         raise typer.Exit(1) from exception
@@ -566,26 +924,8 @@ def pre_commit(
             " the current working directory.",
         ),
     ],
-    verbose: Annotated[
-        bool,
-        typer.Option(
-            "--verbose",
-            "-v",
-            callback=verbose_callback,
-            help="When passed the logger's threshold will be decreased by 10"
-            " (may be passed multiple times)",
-        ),
-    ] = False,
-    quiet: Annotated[
-        bool,
-        typer.Option(
-            "--quiet",
-            "-q",
-            callback=quiet_callback,
-            help="When passed the logger's threshold will be increased by 10"
-            " (may be passed multiple times)",
-        ),
-    ] = False,
+    verbose: VerboseOption = False,
+    quiet: QuietOption = False,
 ) -> None:
     """Install a pre-commit git hook which will run Lemming."""
     if verbose and quiet:
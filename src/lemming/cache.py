@@ -0,0 +1,273 @@
+"""
+Lemming is a tool for formatting and linting code.
+
+Copyright (C) 2022-2024  Koviubi56
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# SPDX-License-Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import hashlib
+import os
+import pathlib
+import re
+import sys
+import time
+from operator import itemgetter
+from stat import S_ISDIR
+from typing import TYPE_CHECKING
+
+from . import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from .config import FormatterOrLinter
+
+# the config files of common tools, in the current working directory; they
+# are part of the cache key, since they change the results of the tools
+TOOL_CONFIG_FILES = (
+    "pyproject.toml",
+    "setup.cfg",
+    "tox.ini",
+    "mypy.ini",
+    ".mypy.ini",
+    "ruff.toml",
+    ".ruff.toml",
+    ".flake8",
+    ".pylintrc",
+    "pylintrc",
+    ".isort.cfg",
+    ".pydocstyle",
+    ".bandit",
+)
+# cache entries which weren't used for this long are removed
+MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+
+def get_cache_directory() -> pathlib.Path:
+    """
+    Get the directory where the results are cached.
+
+    Returns:
+        pathlib.Path: `$XDG_CACHE_HOME/lemming/results`, or
+            `~/.cache/lemming/results` if XDG_CACHE_HOME is not set.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or (
+        pathlib.Path.home() / ".cache"
+    )
+    return pathlib.Path(cache_home) / "lemming" / "results"
+
+
+def _scan_directory(directory: str) -> Iterator[tuple[str, os.stat_result]]:
+    try:
+        with os.scandir(directory) as iterator:
+            entries = list(iterator)
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if (
+                    not entry.name.startswith(".")
+                    and entry.name != "__pycache__"
+                ):
+                    yield from _scan_directory(entry.path)
+            elif entry.is_file():
+                yield entry.path, entry.stat()
+        except OSError:  # noqa: PERF203
+            continue
+
+
+def iter_file_stats(
+    paths: Iterable[pathlib.Path],
+) -> Iterator[tuple[str, os.stat_result]]:
+    """
+    Yield the files in `paths` and their stats, walking directories.
+
+    Directories are walked with `os.scandir`, so the file type comes from the
+    directory entry and no `pathlib.Path` is created per file.
+
+    Hidden directories and `__pycache__` are skipped, because tools write
+    their own caches there (e.g. `.mypy_cache`). Files that can't be
+    accessed are skipped too.
+
+    Args:
+        paths (Iterable[pathlib.Path]): The files and directories.
+
+    Yields:
+        tuple[str, os.stat_result]: The file's path and its stat.
+    """
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        if S_ISDIR(stat.st_mode):
+            yield from _scan_directory(os.fspath(path))
+        else:
+            yield os.fspath(path), stat
+
+
+def get_installed_version(requirement: str) -> str:
+    """
+    Get the installed version of the package in `requirement`.
+
+    Args:
+        requirement (str): The requirement, like "ruff" or "black==23.1.0".
+
+    Returns:
+        str: The installed version, or "" if it is not installed.
+    """
+    # importlib.metadata is slow to import, and it is rarely needed
+    import importlib.metadata  # noqa: PLC0415
+
+    name = re.split(r"[\s<>=!~;@\[]", requirement.strip(), maxsplit=1)[0]
+    try:
+        return importlib.metadata.version(name)
+    except (importlib.metadata.PackageNotFoundError, ValueError):
+        return ""
+
+
+def get_files_digest(
+    paths: Iterable[pathlib.Path], config_files: Iterable[pathlib.Path] = ()
+) -> str:
+    """
+    Get a digest of the files in `paths` and of `config_files`.
+
+    The digest changes if any file's path, size or modification time
+    changes, or if a config file is created or deleted. Compute it once per
+    run, and pass it to `get_key` for every tool, so the files are only
+    walked once.
+
+    Args:
+        paths (Iterable[pathlib.Path]): The files and directories.
+        config_files (Iterable[pathlib.Path], optional): Files outside of
+            `paths` which change the results of the tools, like the lemming
+            config and `TOOL_CONFIG_FILES`. They don't have to exist.
+            Defaults to ().
+
+    Returns:
+        str: The digest.
+    """
+    hash_ = hashlib.blake2b(digest_size=16)
+    for file, stat in sorted(iter_file_stats(paths), key=itemgetter(0)):
+        hash_.update(f"\0{file}\0{stat.st_mtime_ns}\0{stat.st_size}".encode())
+    for config_file in config_files:
+        try:
+            stat = config_file.stat()
+        except OSError:  # noqa: PERF203
+            hash_.update(f"\1{config_file}\0-".encode())
+        else:
+            hash_.update(
+                f"\1{config_file}\0{stat.st_mtime_ns}\0{stat.st_size}".encode()
+            )
+    return hash_.hexdigest()
+
+
+def get_key(tool: FormatterOrLinter, command: str, files_digest: str) -> str:
+    """
+    Get the cache key of running `command` of `tool` on some files.
+
+    The key changes if the tool's configuration, the installed versions of
+    its packages, the command, the python executable, or the files change.
+
+    Nothing else is seen: e.g. modules that a type checker follows outside
+    of the checked paths, config files in other directories, or
+    environment variables. Changing those may leave a stale successful
+    result in the cache.
+
+    Args:
+        tool (FormatterOrLinter): The formatter or linter.
+        command (str): The command that will be run.
+        files_digest (str): The digest of the files to check, from
+            `get_files_digest`.
+
+    Returns:
+        str: The key.
+    """
+    hash_ = hashlib.blake2b(digest_size=16)
+    hash_.update(tool.model_dump_json().encode())
+    for package in tool.packages:
+        hash_.update(f"\0{get_installed_version(package)}".encode())
+    hash_.update(command.encode())
+    hash_.update(sys.executable.encode())
+    hash_.update(files_digest.encode())
+    return hash_.hexdigest()
+
+
+def is_cached(key: str) -> bool:
+    """
+    Is there a successful run cached with the key `key`?
+
+    A hit refreshes the entry's modification time, so entries which are
+    still used are not removed by `prune`.
+
+    Args:
+        key (str): The key.
+
+    Returns:
+        bool: True if there is, False otherwise.
+    """
+    path = get_cache_directory() / key
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    except OSError:
+        return path.exists()
+    return True
+
+
+def set_cached(key: str) -> None:
+    """
+    Cache a successful run with the key `key`.
+
+    Failing to write the cache is not an error, it is only logged.
+
+    Args:
+        key (str): The key.
+    """
+    cache_directory = get_cache_directory()
+    try:
+        cache_directory.mkdir(parents=True, exist_ok=True)
+        (cache_directory / key).write_text("ok", encoding="utf-8")
+    except OSError:
+        logger.warning(f"Could not write cache file {key!r}", True)
+
+
+def prune(max_age_seconds: float = MAX_AGE_SECONDS) -> None:
+    """
+    Remove the cache entries which weren't used for `max_age_seconds`.
+
+    Failing to remove an entry is not an error, it is skipped.
+
+    Args:
+        max_age_seconds (float, optional): The maximum age of the entries.
+            Defaults to `MAX_AGE_SECONDS`.
+    """
+    oldest = time.time() - max_age_seconds
+    try:
+        with os.scandir(get_cache_directory()) as iterator:
+            entries = list(iterator)
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < oldest:
+                pathlib.Path(entry.path).unlink()
+        except OSError:  # noqa: PERF203
+            continue
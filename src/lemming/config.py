@@ -18,19 +18,32 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 # SPDX-License-Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import atexit
+import concurrent.futures
+import functools
 import os
 import pathlib
-import secrets
+import re
 import shlex
+import shutil
 import subprocess
 import sys
-from collections.abc import Iterable
-from typing import cast
+import threading
+from typing import TYPE_CHECKING, Any, Literal
 
+import mylog
 import pydantic
-from typing_extensions import NamedTuple, Self, TypeVar
+from typing_extensions import NamedTuple, TypeVar
+
+from . import cache, logger
+from .cpu import get_cpu_count
 
-from . import logger
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from typing_extensions import Self
 
 try:
     import tomllib  # novermin
@@ -48,6 +61,20 @@ CONFIG_HAS_NO_LEMMING_STUFF = ValueError(
     # we search for config["tool"]["lemming"]
 )
 T = TypeVar("T")
+# a requirement pinned to an exact version, like "black==23.1.0"
+PINNED_REQUIREMENT = re.compile(r"\s*([A-Za-z0-9._-]+)\s*==\s*([^\s;,*]+)\s*")
+# the placeholders replaced in the commands
+COMMAND_PLACEHOLDER = re.compile(r"\{(pyexe|path|packages)\}")
+# below this many paths batching isn't worth spawning more processes
+BATCH_THRESHOLD = 32
+# pip must not be run concurrently in the same environment
+_INSTALL_LOCK = threading.Lock()
+# the requirements installed by this process, guarded by _INSTALL_LOCK
+_INSTALLED: set[str] = set()
+# set after uv failed, so that it isn't tried again in this process
+_UV_FAILED = threading.Event()
+# what installs the packages; "auto" is uv if it is installed, else pip
+Installer = Literal["auto", "pip", "uv"]
 
 
 class WhatToQuiet(NamedTuple):
@@ -57,6 +84,230 @@ class WhatToQuiet(NamedTuple):
     pip: bool
 
 
+def split_into_batches(
+    paths: Sequence[pathlib.Path], batches: int
+) -> list[list[pathlib.Path]]:
+    """
+    Split `paths` into at most `batches` batches of (nearly) equal size.
+
+    Args:
+        paths (Sequence[pathlib.Path]): The paths to split.
+        batches (int): The maximum number of batches.
+
+    Returns:
+        list[list[pathlib.Path]]: The batches.
+    """
+    size = max(1, -(-len(paths) // batches))
+    return [list(paths[i : i + size]) for i in range(0, len(paths), size)]
+
+
+@functools.lru_cache(maxsize=64)
+def split_command(command: str) -> tuple[str, ...]:
+    """
+    Split `command` into arguments, like a shell would.
+
+    The results are cached, since the same commands are run many times.
+
+    Args:
+        command (str): The command, possibly with placeholders.
+
+    Returns:
+        tuple[str, ...]: The arguments.
+    """
+    return tuple(shlex.split(command.strip(), posix=os.name != "nt"))
+
+
+@functools.lru_cache(maxsize=64)
+def compile_command(
+    command: str, packages: tuple[str, ...]
+) -> tuple[tuple[str, bool], ...]:
+    """
+    Split `command`, and replace the placeholders that don't depend on paths.
+
+    `{pyexe}` and `{packages}` are the same every time a tool's command is
+    run, so they are replaced once, and only `{path}` is left to replace
+    when the command is run. A `{packages}` argument becomes one argument
+    per package. The results are cached.
+
+    Args:
+        command (str): The command, possibly with placeholders.
+        packages (tuple[str, ...]): The packages of the tool.
+
+    Returns:
+        tuple[tuple[str, bool], ...]: The arguments, and whether or not
+            `{path}` must still be replaced in them.
+    """
+    replacements = {"pyexe": sys.executable, "packages": " ".join(packages)}
+    arguments: list[tuple[str, bool]] = []
+    for argument in split_command(command):
+        if argument == "{packages}":
+            arguments.extend((package, False) for package in packages)
+        elif "{path}" in argument:
+            arguments.append((argument, True))
+        elif "{" in argument:
+            arguments.append(
+                (
+                    COMMAND_PLACEHOLDER.sub(
+                        lambda match: replacements[match[1]], argument
+                    ),
+                    False,
+                )
+            )
+        else:
+            arguments.append((argument, False))
+    return tuple(arguments)
+
+
+@functools.cache
+def get_devnull() -> int:
+    """
+    Open `os.devnull` for writing, once per process.
+
+    The same file descriptor is used for every quiet command, instead of
+    `subprocess.DEVNULL`, which opens and closes `os.devnull` for every
+    command. It is closed when the interpreter exits.
+
+    Returns:
+        int: The file descriptor.
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    atexit.register(os.close, devnull)
+    return devnull
+
+
+def run_arguments(arguments: list[str], quiet: bool) -> bool:
+    """
+    Run the command `arguments`.
+
+    Args:
+        arguments (list[str]): The command, split into arguments.
+        quiet (bool): Don't let the command write to stdout and stderr
+
+    Returns:
+        bool: `exit_status == 0`
+    """
+    # the arguments may include thousands of paths, don't format them for
+    # nothing
+    log_info = logger.is_enabled_for(mylog.Level.INFO)
+    if log_info:
+        logger.info(f"Running command {arguments!r}")
+    if quiet:
+        stdout: int | None = get_devnull()
+        stderr: int | None = stdout
+    elif logger.is_buffering():
+        # the tools run in parallel, write the output after the logs of the
+        # tool, so it isn't interleaved with other tools
+        stdout, stderr = subprocess.PIPE, subprocess.STDOUT
+    else:
+        stdout = stderr = None
+    completed_process = subprocess.run(
+        arguments,
+        shell=False,  # noqa: S603
+        check=False,
+        stdout=stdout,
+        stderr=stderr,
+    )
+    if completed_process.stdout:
+        logger.write_output(completed_process.stdout)
+    exit_status = completed_process.returncode
+    if exit_status == 0:
+        if log_info:
+            logger.info(f"Successfully ran command {shlex.join(arguments)!r}")
+        return True
+    logger.error(
+        f"Command {shlex.join(arguments)!r} returned non-zero exit status"
+        f" {exit_status}"
+    )
+    return False
+
+
+@functools.cache
+def find_uv() -> str | None:
+    """
+    Find the uv executable.
+
+    Returns:
+        str | None: The path to uv, or None if it is not installed.
+    """
+    return shutil.which("uv")
+
+
+def is_installed(requirement: str) -> bool:
+    """
+    Is `requirement` pinned to an exact version, which is already installed?
+
+    Unpinned requirements are never considered installed, since they should
+    be upgraded.
+
+    Args:
+        requirement (str): The requirement, like "ruff" or "black==23.1.0".
+
+    Returns:
+        bool: True if it is, False otherwise.
+    """
+    match = PINNED_REQUIREMENT.fullmatch(requirement)
+    if not match:
+        return False
+    return cache.get_installed_version(requirement) == match[2]
+
+
+def install_packages(
+    packages: Iterable[str], quiet: bool, installer: Installer = "auto"
+) -> bool:
+    """
+    Install `packages` with pip, except the ones already installed by us.
+
+    Packages pinned to the version that is already installed are skipped,
+    too. With the "auto" installer, uv is used instead of pip if it is
+    installed, because it is much faster. If uv fails, pip is tried too, and
+    uv isn't tried again in this process. Note that uv doesn't read pip's
+    config (e.g. `PIP_INDEX_URL`), use the "pip" installer if you need it.
+
+    Args:
+        packages (Iterable[str]): The packages' names (optionally versions
+            with "==x.y.z").
+        quiet (bool): Don't let `pip` write to stdout and stderr.
+        installer (Installer, optional): What to install the packages with:
+            "auto", "pip" or "uv". Defaults to "auto".
+
+    Returns:
+        bool: `exit_status == 0`, or True if there was nothing to install.
+    """
+    with _INSTALL_LOCK:
+        missing = [
+            package
+            for package in dict.fromkeys(packages)
+            if package not in _INSTALLED
+        ]
+        _INSTALLED.update(filter(is_installed, missing))
+        missing = [package for package in missing if package not in _INSTALLED]
+        if not missing:
+            return True
+        logger.info(f"Installing {missing}")
+        with logger.indent:
+            success = False
+            uv = None if installer == "pip" else find_uv()
+            if installer == "uv" and not uv:
+                logger.error("The installer is uv, but uv is not installed!")
+                return False
+            if uv and (installer == "uv" or not _UV_FAILED.is_set()):
+                arguments = ["pip", "install", "--python", sys.executable]
+                success = run_arguments(
+                    [uv, *arguments, "-U", *missing], quiet
+                )
+                if not success and installer == "auto":
+                    _UV_FAILED.set()
+                    logger.warning("Could not install with uv, trying pip")
+            if not success and installer != "uv":
+                success = run_arguments(
+                    [sys.executable, "-m", "pip", "install", "-U", *missing],
+                    quiet,
+                )
+        if success:
+            _INSTALLED.update(missing)
+        return success
+
+
 class FormatterOrLinter(pydantic.BaseModel):
     """
     An ABC for formatters and linters.
@@ -66,10 +317,15 @@ class FormatterOrLinter(pydantic.BaseModel):
             specify which formatter/linter to run. Defaults to packages[0].
         packages (list[str]): The packages' names (optionally versions
             with "==x.y.z") to install with pip.
+        batch (bool, optional): Whether or not the paths may be split into
+            batches, which are checked in parallel. Defaults to False.
     """
 
+    model_config = pydantic.ConfigDict(extra="forbid")
+
     name: str = ""
     packages: list[str]
+    batch: bool = False
 
     @pydantic.model_validator(mode="after")
     def _validate_name(self, _: object) -> Self:
@@ -77,6 +333,9 @@ class FormatterOrLinter(pydantic.BaseModel):
             try:
                 self.name = self.packages[0]
             except IndexError:
+                # only needed for this rare mistake, don't import it otherwise
+                import secrets  # noqa: PLC0415
+
                 name = secrets.token_hex(2)
                 logger.warning(
                     "A formatter or linter does not have packages nor a name!"
@@ -86,6 +345,16 @@ class FormatterOrLinter(pydantic.BaseModel):
                 self.name = name
         return self
 
+    @functools.cached_property
+    def packages_joined(self) -> str:
+        """
+        The packages, joined with spaces, computed once.
+
+        Returns:
+            str: `" ".join(self.packages)`
+        """
+        return " ".join(self.packages)
+
     def replace_command(
         self,
         command: str,
@@ -102,6 +371,9 @@ class FormatterOrLinter(pydantic.BaseModel):
 
         \*: `" ".join()` will be used
 
+        The placeholders are replaced in one pass, so a path that contains a
+        placeholder is left as is.
+
         Args:
             command (str): The command.
             paths_to_check (Iterable[pathlib.Path]): Paths to check.
@@ -109,13 +381,52 @@ class FormatterOrLinter(pydantic.BaseModel):
         Returns:
             str: The new command.
         """
-        return (
-            command.strip()
-            .replace("{pyexe}", sys.executable)
-            .replace("{path}", " ".join(map(str, paths_to_check)))
-            .replace("{packages}", " ".join(self.packages))
+        paths = ""
+        if "{path}" in command:
+            paths = " ".join(map(os.fspath, paths_to_check))
+        replacements = {
+            "pyexe": sys.executable,
+            "path": paths,
+            "packages": self.packages_joined,
+        }
+        return COMMAND_PLACEHOLDER.sub(
+            lambda match: replacements[match[1]], command.strip()
         )
 
+    def get_arguments(
+        self,
+        command: str,
+        paths_to_check: Iterable[pathlib.Path],
+    ) -> list[str]:
+        """
+        Split `command` into arguments, and replace the placeholders.
+
+        The command is split before the placeholders are replaced, so a
+        `{path}` or `{packages}` argument becomes one argument per path or
+        package, and paths with spaces don't need to be quoted. Everything
+        but `{path}` is replaced once per command by `compile_command`;
+        `{path}` inside an argument is replaced with `replace_command`.
+
+        Args:
+            command (str): The command.
+            paths_to_check (Iterable[pathlib.Path]): Paths to check.
+
+        Returns:
+            list[str]: The arguments.
+        """
+        paths = list(paths_to_check)
+        arguments: list[str] = []
+        for argument, has_paths in compile_command(
+            command, tuple(self.packages)
+        ):
+            if not has_paths:
+                arguments.append(argument)
+            elif argument == "{path}":
+                arguments.extend(map(os.fspath, paths))
+            else:
+                arguments.append(self.replace_command(argument, paths))
+        return arguments
+
     def run_command(
         self,
         command: str,
@@ -133,48 +444,78 @@ class FormatterOrLinter(pydantic.BaseModel):
         Returns:
             bool: `exit_status == 0`
         """
-        command = self.replace_command(command, paths_to_check)
-
-        splitted = shlex.split(command, posix=os.name != "nt")
-        logger.info(f"Running command {splitted!r}")
-        quiet_kwargs = (
-            {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
-            if quiet
-            else {}
+        return run_arguments(
+            self.get_arguments(command, paths_to_check), quiet
         )
-        completed_process = cast(
-            subprocess.CompletedProcess[str],
-            subprocess.run(  # type: ignore[call-overload]
-                splitted,
-                shell=False,  # noqa: S603
-                check=False,
-                **quiet_kwargs,
-            ),
-        )
-        exit_status = completed_process.returncode
-        if exit_status == 0:
-            logger.info(f"Successfully ran command {command!r}")
-            return True
-        logger.error(
-            f"Command {command!r} returned non-zero exit status {exit_status}"
-        )
-        return False
 
-    def install(self, quiet: bool) -> bool:
+    def run_command_batched(
+        self,
+        command: str,
+        paths_to_check: Iterable[pathlib.Path],
+        quiet: bool,
+        max_batches: int | None = None,
+    ) -> bool:
+        """
+        Run command `command`, in batches if `self.batch`.
+
+        If `self.batch` is True, the command contains `{path}`, and there are
+        at least `BATCH_THRESHOLD` paths, then the paths are split into
+        `max_batches` batches, and the command is run for each batch in
+        parallel. Otherwise this is the same as `run_command`.
+
+        Args:
+            command (str): The command to run.
+            paths_to_check (Iterable[pathlib.Path]): The paths to check.
+            quiet (bool): Don't let the command write to stdout and stderr
+            max_batches (int | None, optional): The maximum number of
+                batches, usually the number of CPUs this tool may use. If
+                None, one per CPU. Defaults to None.
+
+        Returns:
+            bool: Whether or not all exit statuses were 0.
         """
-        Install the packages.
+        paths = list(paths_to_check)
+        # without {path} every batch would run the very same command
+        if (
+            not self.batch
+            or "{path}" not in command
+            or len(paths) < BATCH_THRESHOLD
+        ):
+            return self.run_command(command, paths, quiet)
+        batches = split_into_batches(paths, max_batches or get_cpu_count())
+        if len(batches) < 2:  # noqa: PLR2004
+            return self.run_command(command, paths, quiet)
+        logger.info(f"Running command in {len(batches)} batches")
+        indentation = logger.indentation
+
+        def run_batch(
+            batch: list[pathlib.Path],
+        ) -> tuple[bool, list[mylog.LogEvent | bytes]]:
+            with logger.buffer(indentation) as buffer:
+                return self.run_command(command, batch, quiet), buffer
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(batches)
+        ) as executor:
+            results = list(executor.map(run_batch, batches))
+        # in the order of the batches, not interleaved
+        for _, buffer in results:
+            logger.replay(buffer)
+        return all(success for success, _ in results)
+
+    def install(self, quiet: bool, installer: Installer = "auto") -> bool:
+        """
+        Install the packages, unless they are already installed.
 
         Args:
             quiet (bool): Don't let `pip` write to stdout and stderr.
+            installer (Installer, optional): What to install the packages
+                with. See `install_packages`. Defaults to "auto".
 
         Returns:
             bool: `exit_status == 0`
         """
-        logger.info(f"Installing {self.packages}")
-        with logger.indent:
-            return self.run_command(
-                "{pyexe} -m pip install -U {packages}", [], quiet
-            )
+        return install_packages(self.packages, quiet, installer)
 
 
 class Formatter(FormatterOrLinter):
@@ -201,6 +542,9 @@ class Formatter(FormatterOrLinter):
         self,
         paths_to_check: Iterable[pathlib.Path],
         what_to_quiet: WhatToQuiet,
+        install: bool = True,
+        max_batches: int | None = None,
+        installer: Installer = "auto",
     ) -> bool:
         """
         Format the code.
@@ -208,20 +552,29 @@ class Formatter(FormatterOrLinter):
         Args:
             paths_to_check (Iterable[pathlib.Path]): The paths to format.
             what_to_quiet (WhatToQuiet): What to quiet.
+            install (bool, optional): Whether or not to install the packages
+                first. Defaults to True.
+            max_batches (int | None, optional): The maximum number of
+                batches, if `self.batch`. See `run_command_batched`. Defaults
+                to None.
+            installer (Installer, optional): What to install the packages
+                with. See `install_packages`. Defaults to "auto".
 
         Returns:
             bool: `exit_status == 0`
         """
-        install_success = self.install(what_to_quiet.pip)
-        if not install_success:
+        if install and not self.install(what_to_quiet.pip, installer):
             logger.error(
                 f"Could not install the packages {self.packages}! See"
                 " pip's output for more information."
             )
             return False
 
-        success = self.run_command(
-            self.format_command, paths_to_check, what_to_quiet.commands
+        success = self.run_command_batched(
+            self.format_command,
+            paths_to_check,
+            what_to_quiet.commands,
+            max_batches,
         )
         if success or self.allow_nonzero_on_format:
             logger.info(f"Successfully ran (format) formatter {self.name}!")
@@ -240,6 +593,9 @@ class Formatter(FormatterOrLinter):
         self,
         paths_to_check: Iterable[pathlib.Path],
         what_to_quiet: WhatToQuiet,
+        install: bool = True,
+        max_batches: int | None = None,
+        installer: Installer = "auto",
     ) -> bool:
         """
         Check the code.
@@ -247,6 +603,13 @@ class Formatter(FormatterOrLinter):
         Args:
             paths_to_check (Iterable[pathlib.Path]): Paths to check.
             what_to_quiet (WhatToQuiet): What to quiet.
+            install (bool, optional): Whether or not to install the packages
+                first. Defaults to True.
+            max_batches (int | None, optional): The maximum number of
+                batches, if `self.batch`. See `run_command_batched`. Defaults
+                to None.
+            installer (Installer, optional): What to install the packages
+                with. See `install_packages`. Defaults to "auto".
 
         Returns:
             bool: `exit_status == 0`
@@ -258,16 +621,18 @@ class Formatter(FormatterOrLinter):
             )
             return True
 
-        install_success = self.install(what_to_quiet.pip)
-        if not install_success:
+        if install and not self.install(what_to_quiet.pip, installer):
             logger.error(
                 f"Could not install the packages {self.packages}! See"
                 " pip's output for more information."
             )
             return False
 
-        success = self.run_command(
-            self.check_command, paths_to_check, what_to_quiet.commands
+        success = self.run_command_batched(
+            self.check_command,
+            paths_to_check,
+            what_to_quiet.commands,
+            max_batches,
         )
         if success:
             logger.info(f"Successfully ran (check) formatter {self.name}!")
@@ -301,6 +666,9 @@ class Linter(FormatterOrLinter):
         self,
         paths_to_check: Iterable[pathlib.Path],
         what_to_quiet: WhatToQuiet,
+        install: bool = True,
+        max_batches: int | None = None,
+        installer: Installer = "auto",
     ) -> bool:
         """
         Lint the code.
@@ -308,20 +676,29 @@ class Linter(FormatterOrLinter):
         Args:
             paths_to_check (Iterable[pathlib.Path]): Paths to lint.
             what_to_quiet (WhatToQuiet): What to quiet.
+            install (bool, optional): Whether or not to install the packages
+                first. Defaults to True.
+            max_batches (int | None, optional): The maximum number of
+                batches, if `self.batch`. See `run_command_batched`. Defaults
+                to None.
+            installer (Installer, optional): What to install the packages
+                with. See `install_packages`. Defaults to "auto".
 
         Returns:
             bool: `exit_status == 0`
         """
-        install_success = self.install(what_to_quiet.pip)
-        if not install_success:
+        if install and not self.install(what_to_quiet.pip, installer):
             logger.error(
                 f"Could not install packages {self.packages}! See"
                 " pip's output for more information."
             )
             return False
 
-        success = self.run_command(
-            self.command, paths_to_check, what_to_quiet.commands
+        success = self.run_command_batched(
+            self.command,
+            paths_to_check,
+            what_to_quiet.commands,
+            max_batches,
         )
         if success:
             logger.info(f"Successfully ran linter {self.name}!")
@@ -343,11 +720,85 @@ class Config(pydantic.BaseModel):
         linters (list[Linter], optional): The linters. Default factory is list.
         fail_fast (bool, optional): Whether or not to immediately quit when a
             formatter or linter fails.
+        parallel (bool, optional): Whether or not to run the linters (and the
+            formatters when checking) in parallel. Defaults to False.
+        cache (bool, optional): Whether or not to skip the linters (and the
+            formatters when checking) if they already succeeded on the same,
+            unchanged files. Defaults to False.
+        installer (Installer, optional): What to install the packages with:
+            "auto" (uv if it is installed, else pip), "pip" or "uv". Defaults
+            to "auto".
     """
 
+    model_config = pydantic.ConfigDict(extra="forbid")
+
     formatters: list[Formatter] = pydantic.Field(default_factory=list)
     linters: list[Linter] = pydantic.Field(default_factory=list)
     fail_fast: bool = True
+    parallel: bool = False
+    cache: bool = False
+    installer: Installer = "auto"
+
+    def install_all(
+        self,
+        quiet: bool,
+        only: frozenset[str] | None = None,
+        installer: Installer | None = None,
+        format_: bool = True,
+    ) -> bool:
+        """
+        Install the packages of the formatters and linters with one pip run.
+
+        Args:
+            quiet (bool): Don't let `pip` write to stdout and stderr.
+            only (frozenset[str] | None, optional): Only install the packages
+                of these formatters/linters. If None, install all. Defaults
+                to None.
+            installer (Installer | None, optional): What to install the
+                packages with. If None, `self.installer`. Defaults to None.
+            format_ (bool, optional): Whether the formatters will format or
+                check. If False, the formatters without a check_command are
+                skipped, so their packages are not installed. Defaults to
+                True.
+
+        Returns:
+            bool: `exit_status == 0`
+        """
+        formatters = [
+            formatter
+            for formatter in self.formatters
+            if format_ or formatter.check_command
+        ]
+        return install_packages(
+            (
+                package
+                for tool in (*formatters, *self.linters)
+                if only is None or tool.name in only
+                for package in tool.packages
+            ),
+            quiet,
+            installer or self.installer,
+        )
+
+    @functools.cached_property
+    def first_linters(self) -> list[Linter]:
+        """
+        The first linters, computed once.
+
+        Returns:
+            list[Linter]: The linters, where `linter.run_first is True`
+        """
+        return [linter for linter in self.linters if linter.run_first]
+
+    @functools.cached_property
+    def other_linters(self) -> list[Linter]:
+        """
+        The other linters, computed once.
+
+        Returns:
+            list[Linter]: The linters, where `linter.run_first is False`
+        """
+        return [linter for linter in self.linters if not linter.run_first]
 
     def get_first_linters(self) -> list[Linter]:
         """
@@ -356,7 +807,7 @@ class Config(pydantic.BaseModel):
         Returns:
             list[Linter]: Get linters, where `linter.run_first is True`
         """
-        return [linter for linter in self.linters if linter.run_first]
+        return self.first_linters
 
     def get_other_linters(self) -> list[Linter]:
         """
@@ -365,7 +816,93 @@ class Config(pydantic.BaseModel):
         Returns:
             list[Linter]: Get linters, where `linter.run_first is False`
         """
-        return [linter for linter in self.linters if not linter.run_first]
+        return self.other_linters
+
+
+@functools.lru_cache(maxsize=32)
+def _read_toml(path: str, _mtime_ns: int, _size: int) -> dict[str, Any]:
+    """
+    Read and parse the TOML file at `path`.
+
+    The modification time and the size are only used as part of the cache
+    key, so that the cache is invalidated when the file changes.
+
+    Args:
+        path (str): The TOML file to read.
+        _mtime_ns (int): The file's modification time in nanoseconds.
+        _size (int): The file's size in bytes.
+
+    Returns:
+        dict[str, Any]: The parsed TOML document. It is shared, don't modify
+            it.
+    """
+    with pathlib.Path(path).open("rb") as fp:
+        return tomllib.load(fp)
+
+
+def read_toml(file: pathlib.Path) -> dict[str, Any]:
+    """
+    Read and parse the TOML file `file`, reusing the result if it's unchanged.
+
+    Args:
+        file (pathlib.Path): The TOML file to read.
+
+    Returns:
+        dict[str, Any]: The parsed TOML document. It is shared, don't modify
+            it.
+    """
+    stat = file.stat()
+    return _read_toml(str(file), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_config(
+    path: str, pyproject: bool, _mtime_ns: int, _size: int
+) -> Config:
+    """
+    Read, parse and validate the config file at `path`.
+
+    The modification time and the size are only used as part of the cache
+    key, so that the cache is invalidated when the file changes.
+
+    Args:
+        path (str): The config file.
+        pyproject (bool): Whether or not the file uses the `pyproject.toml`
+            syntax (instead of the `.lemming.toml` syntax).
+        _mtime_ns (int): The file's modification time in nanoseconds.
+        _size (int): The file's size in bytes.
+
+    Raises:
+        ValueError: If `pyproject` is True and the config file does not
+            contain a tool.lemming key.
+
+    Returns:
+        Config: The configuration.
+    """
+    # find_config_file may have parsed it already, see has_lemming_table
+    document = _read_toml(path, _mtime_ns, _size)
+    if pyproject:
+        try:
+            document = document["tool"]["lemming"]
+        except KeyError as exception:
+            raise CONFIG_HAS_NO_LEMMING_STUFF from exception
+    return Config.model_validate(document)
+
+
+def load_config(file: pathlib.Path, pyproject: bool) -> Config:
+    """
+    Get the config from `file`, reusing the result if the file is unchanged.
+
+    Args:
+        file (pathlib.Path): The config file to read from.
+        pyproject (bool): Whether or not the file uses the `pyproject.toml`
+            syntax (instead of the `.lemming.toml` syntax).
+
+    Returns:
+        Config: The configuration.
+    """
+    stat = file.stat()
+    return _load_config(str(file), pyproject, stat.st_mtime_ns, stat.st_size)
 
 
 def get_config_dot_lemming(file: pathlib.Path) -> Config:
@@ -379,9 +916,7 @@ def get_config_dot_lemming(file: pathlib.Path) -> Config:
     Returns:
         Config: The configuration.
     """
-    return Config.model_validate(
-        tomllib.loads(file.read_text(encoding="utf-8"))
-    )
+    return load_config(file, pyproject=False)
 
 
 def get_config_pyproject(pyproject: pathlib.Path) -> Config:
@@ -398,18 +933,81 @@ def get_config_pyproject(pyproject: pathlib.Path) -> Config:
     Returns:
         Config: The configuration.
     """
-    config_text = pyproject.read_text(encoding="utf-8")
-    pyproject_config = tomllib.loads(config_text)
-    try:
-        lemming_config = pyproject_config["tool"]["lemming"]
-    except KeyError as exception:
-        raise CONFIG_HAS_NO_LEMMING_STUFF from exception
-    return Config.model_validate(lemming_config)
+    return load_config(pyproject, pyproject=True)
+
+
+def has_lemming_table(pyproject: pathlib.Path) -> bool:
+    """
+    Does the `pyproject.toml` file `pyproject` have a tool.lemming table?
+
+    The file is only parsed if it mentions lemming at all, so unrelated
+    `pyproject.toml` files are cheap to skip. The parsed document is cached
+    (see `read_toml`), so loading the config doesn't parse it again.
+
+    Args:
+        pyproject (pathlib.Path): The `pyproject.toml` file.
+
+    Returns:
+        bool: True if it has, False otherwise.
+    """
+    if b"lemming" not in pyproject.read_bytes():
+        return False
+    tool = read_toml(pyproject).get("tool")
+    return isinstance(tool, dict) and "lemming" in tool
+
+
+@functools.lru_cache(maxsize=16)
+def find_config_file(folder: pathlib.Path) -> pathlib.Path:
+    """
+    Find the config file in `folder` or the closest parent folder.
+
+    A `pyproject.toml` file without a tool.lemming table is skipped, so the
+    search continues in the parent folder (see `has_lemming_table`). The
+    results are cached, so the same folders are not searched again (see
+    `clear_config_cache`).
+
+    Args:
+        folder (pathlib.Path): The (absolute) folder to start searching in.
+
+    Raises:
+        FileNotFoundError: If no `pyproject.toml` nor `.lemming.toml` file was
+            found in `folder` and its parents.
+
+    Returns:
+        pathlib.Path: The `.lemming.toml` or `pyproject.toml` file.
+    """
+    for directory in (folder, *folder.parents):
+        config_file = directory / CONFIG_FILE_NAME
+        if config_file.exists():
+            return config_file
+        pyproject = directory / "pyproject.toml"
+        if pyproject.exists() and has_lemming_table(pyproject):
+            return pyproject
+    raise CONFIG_FILE_NOT_FOUND_EXC from None
+
+
+def load_found_config(config_file: pathlib.Path) -> Config:
+    """
+    Get the config from `config_file`, a result of `find_config_file`.
+
+    Args:
+        config_file (pathlib.Path): The `.lemming.toml` or `pyproject.toml`
+            file.
+
+    Returns:
+        Config: The configuration.
+    """
+    if config_file.name == CONFIG_FILE_NAME:
+        return get_config_dot_lemming(config_file)
+    return get_config_pyproject(config_file)
 
 
 def get_config(_folder: os.PathLike[str] | str) -> Config:
     """
-    Get the configuration from `_folder` or a parent folder recursively.
+    Get the configuration from `_folder` or the closest parent folder.
+
+    If the config file that was found earlier has been deleted since, the
+    search is done again.
 
     Args:
         _folder (os.PathLike[str] | str): The folder to use.
@@ -421,14 +1019,26 @@ def get_config(_folder: os.PathLike[str] | str) -> Config:
     Returns:
         Config: The configuration.
     """
-    folder = pathlib.Path(_folder)
-    config_file = folder / CONFIG_FILE_NAME
-    if config_file.exists():
-        return get_config_dot_lemming(config_file)
-    pyproject = folder / "pyproject.toml"
-    if pyproject.exists():
-        return get_config_pyproject(pyproject)
-    # recursion... recursion recursion...
-    if folder.parent == folder:
-        raise CONFIG_FILE_NOT_FOUND_EXC from None
-    return get_config(folder.parent)
+    folder = pathlib.Path(_folder).absolute()
+    config_file = find_config_file(folder)
+    try:
+        return load_found_config(config_file)
+    except FileNotFoundError:
+        # the cached config file was deleted; lru_cache can't forget just
+        # one entry
+        find_config_file.cache_clear()
+    return load_found_config(find_config_file(folder))
+
+
+def clear_config_cache() -> None:
+    """
+    Forget the found config files and the loaded configs.
+
+    Changed config files are reloaded anyway, and a deleted config file is
+    searched for again by `get_config`. But if a config file is created
+    closer to a folder that was already searched, the cached (farther)
+    config file is used until this is called.
+    """
+    find_config_file.cache_clear()
+    _load_config.cache_clear()
+    _read_toml.cache_clear()
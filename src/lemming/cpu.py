@@ -0,0 +1,38 @@
+"""
+Lemming is a tool for formatting and linting code.
+
+Copyright (C) 2022-2024  Koviubi56
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# SPDX-License-Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import os
+
+
+def get_cpu_count() -> int:
+    """
+    Get the number of CPUs this process may use.
+
+    In containers with a restricted CPU set, this is less than
+    `os.cpu_count()`, which counts all CPUs of the host.
+
+    Returns:
+        int: The number of usable CPUs, at least 1.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
@@ -0,0 +1,89 @@
+"""
+Lemming is a tool for formatting and linting code.
+
+Copyright (C) 2022-2024  Koviubi56
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# SPDX-License-Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import pathlib
+import threading
+from typing import TYPE_CHECKING
+
+from lemming import config
+
+if TYPE_CHECKING:
+    import pytest
+
+PATHS = [pathlib.Path(f"file{i}.py") for i in range(40)]
+
+
+def run_batched(
+    monkeypatch: pytest.MonkeyPatch, command: str
+) -> list[list[str]]:
+    """
+    Run `command` for `PATHS` with a batched linter, on 4 CPUs.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): The monkeypatch fixture.
+        command (str): The linter's command.
+
+    Returns:
+        list[list[str]]: The arguments of every command that was run.
+    """
+    calls: list[list[str]] = []
+    lock = threading.Lock()
+
+    def run_arguments(arguments: list[str], _: bool) -> bool:
+        with lock:
+            calls.append(arguments)
+        return True
+
+    monkeypatch.setattr(config, "run_arguments", run_arguments)
+    monkeypatch.setattr(config, "get_cpu_count", lambda: 4)
+    linter = config.Linter(
+        name="linter", packages=[], command=command, batch=True
+    )
+    assert linter.run_command_batched(command, PATHS, quiet=True)
+    return calls
+
+
+def test_batched_with_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The paths are split into one batch per CPU."""
+    calls = run_batched(monkeypatch, "linter {path}")
+    assert len(calls) == 4  # noqa: PLR2004
+    assert sorted(
+        argument for arguments in calls for argument in arguments[1:]
+    ) == sorted(map(str, PATHS))
+
+
+def test_batched_without_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A command without {path} is run once, not once per batch."""
+    calls = run_batched(monkeypatch, "linter --all")
+    assert calls == [["linter", "--all"]]
+
+
+def test_get_config_deleted_config_file(tmp_path: pathlib.Path) -> None:
+    """A cached config file that was deleted is searched for again."""
+    config.clear_config_cache()
+    folder = tmp_path / "folder"
+    folder.mkdir()
+    (tmp_path / config.CONFIG_FILE_NAME).write_text("fail_fast = false\n")
+    (folder / config.CONFIG_FILE_NAME).write_text("fail_fast = true\n")
+    assert config.get_config(folder).fail_fast
+    (folder / config.CONFIG_FILE_NAME).unlink()
+    assert not config.get_config(folder).fail_fast